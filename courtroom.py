@@ -0,0 +1,88 @@
+from typing import Dict, List, Tuple
+
+# Import the actual agent teams
+from defense_team import DefenseAttorneyAgent, DefenseStrategistAgent
+from prosecution_team import ProsecutorAgent, ProsecutionStrategistAgent
+from judge import JudgeAgent
+from utils import generate_content # Keep for CaseManager initial summary
+
+
+def build_agents(keys: Dict[str, str]):
+    """Builds the five agents from the per-role API keys returned by get_api_keys()."""
+    # Defense Team (Gemini for Advocate, Groq for Strategist)
+    defense_attorney = DefenseAttorneyAgent(gemini_api_key=keys["gemini_1"], tavily_api_key=keys["tavily"])
+    defense_strategist = DefenseStrategistAgent(groq_api_key=keys["groq_1"], tavily_api_key=keys["tavily"])
+
+    # Prosecution Team (Gemini for Prosecutor, Groq for Strategist)
+    prosecutor = ProsecutorAgent(gemini_api_key=keys["gemini_2"], tavily_api_key=keys["tavily"])
+    prosecution_strategist = ProsecutionStrategistAgent(groq_api_key=keys["groq_2"], tavily_api_key=keys["tavily"])
+
+    # Judge (Groq + Tavily)
+    judge = JudgeAgent(groq_api_key=keys["groq_3"], tavily_api_key=keys["tavily"])
+
+    return defense_attorney, defense_strategist, prosecutor, prosecution_strategist, judge
+
+
+# Helper for Case Summary (using simple utility function)
+class CaseManager:
+    def __init__(self, case_description):
+        self.case_description = case_description
+
+    def summarize_case(self):
+        prompt = f"""
+        Analyze the following legal case description and extract key facts.
+        Provide a structured summary suitable for a legal debate.
+        Keep the summary under 400 words.
+
+        Case Description:
+        {self.case_description}
+        """
+        # Fallback to utils.generate_content (which uses a default key/model)
+        # Ideally this should also use one of the specific keys, but keeping as is for now
+        # assuming utils.py is configured correctly.
+        return generate_content(prompt)
+
+
+def get_briefs(rounds: List[Dict]) -> Tuple[str, str, str, str]:
+    """Accumulates each side's arguments and strategies across rounds."""
+    defense_brief = ""
+    prosecution_brief = ""
+    defense_strategy = ""
+    prosecution_strategy = ""
+
+    for r in rounds:
+        defense_brief += f"\nRound {r['round']}: {r['defense_arg']}\n"
+        prosecution_brief += f"\nRound {r['round']}: {r['prosecution_arg']}\n"
+        defense_strategy += f"\nRound {r['round']}: {r['defense_strat']}\n"
+        prosecution_strategy += f"\nRound {r['round']}: {r['prosecution_strat']}\n"
+
+    return defense_brief, prosecution_brief, defense_strategy, prosecution_strategy
+
+
+def play_round(agents, case_summary: str, rounds: List[Dict]) -> Dict:
+    """Runs the next round (prosecution turn, then defense turn) and returns its data."""
+    defense_attorney, defense_strategist, prosecutor, prosecution_strategist, _ = agents
+    round_num = len(rounds) + 1
+
+    # Get previous context
+    d_brief, p_brief, _, _ = get_briefs(rounds)
+
+    # Prosecution Turn
+    if round_num == 1:
+        p_strat = prosecution_strategist.strategize(case_summary, "Initial Opening Strategy", round_num)
+        p_arg = prosecutor.prosecute(case_summary, "Opening Statement")
+    else:
+        p_strat = prosecution_strategist.strategize(case_summary, d_brief, round_num)
+        p_arg = prosecutor.prosecute(case_summary, d_brief)
+
+    # Defense Turn
+    d_strat = defense_strategist.strategize(case_summary, p_arg, round_num)
+    d_arg = defense_attorney.advocate(case_summary, p_arg)
+
+    return {
+        "round": round_num,
+        "prosecution_strat": p_strat,
+        "prosecution_arg": p_arg,
+        "defense_strat": d_strat,
+        "defense_arg": d_arg
+    }
@@ -1,16 +1,16 @@
 import os
 from typing import List, Dict, Callable
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from tavily import TavilyClient
+from model_router import ModelRouter
 
 class DefenseAttorneyAgent:
     def __init__(self, gemini_api_key: str, tavily_api_key: str, status_callback: Callable[[str], None] = None):
-        # Using Gemini (Default Model)
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash-lite", 
-            google_api_key=gemini_api_key,
+        # Using Gemini, tier picked per call by the router
+        self.router = ModelRouter(
+            provider="gemini",
+            api_key=gemini_api_key,
+            role="defense_attorney",
             temperature=0.5 # Higher temperature allows for more "creative" justification
         )
         self.tavily_client = TavilyClient(api_key=tavily_api_key)
@@ -58,8 +58,7 @@ class DefenseAttorneyAgent:
         ])
         
         try:
-            chain = prompt | self.llm
-            response = chain.invoke({})
+            response = self.router.invoke(prompt, {}, "advocacy", f"{support_context}{model_description}{critique_points or ''}")
             return response.content
         except Exception as e:
             return f"❌ Defense error: {str(e)}"
@@ -78,9 +77,10 @@ class DefenseAttorneyAgent:
 
 class DefenseStrategistAgent:
     def __init__(self, groq_api_key: str, tavily_api_key: str, status_callback: Callable[[str], None] = None):
-        self.llm = ChatGroq(
-            model="llama-3.3-70b-versatile", 
-            groq_api_key=groq_api_key,
+        self.router = ModelRouter(
+            provider="groq",
+            api_key=groq_api_key,
+            role="defense_strategist",
             temperature=0.4 # Slightly creative to find unique angles
         )
         self.tavily_client = TavilyClient(api_key=tavily_api_key)
@@ -92,7 +92,7 @@ class DefenseStrategistAgent:
         response = self.tavily_client.search(query=query, search_depth="advanced", max_results=3)
         return response.get('results', [])
 
-    def dismantle_prosecution(self, model_description: str, prosecutor_argument: str) -> str:
+    def dismantle_prosecution(self, model_description: str, prosecutor_argument: str, round_num: int = None) -> str:
         """The Strategist's core logic: Destroying the Prosecutor's case."""
         if self.status_callback:
             self.status_callback("🕵️ Defense Strategist is analyzing the Prosecution's case...")
@@ -114,6 +114,8 @@ class DefenseStrategistAgent:
             3. Misinterpretation: Have they misunderstood the accused's intent?
             4. Counter-Strategy: Provide 3 specific legal arguments the Defense Lawyer should use in rebuttal.
             
+            LENGTH: Keep your breakdown under 400 words.
+            
             Be sharp, cynical, and 100% on the side of the Defense."""),
             ("user", f"""
             LEGAL LOOPHOLES & PRECEDENTS:
@@ -129,18 +131,17 @@ class DefenseStrategistAgent:
         ])
         
         try:
-            chain = prompt | self.llm
-            response = chain.invoke({})
+            response = self.router.invoke(prompt, {}, "strategy", f"{loophole_context}{model_description}{prosecutor_argument}", round_num)
             return response.content
         except Exception as e:
             return f"❌ Strategy error: {str(e)}"
 
-    def strategize(self, model_data: str, prosecutor_arg: str):
+    def strategize(self, model_data: str, prosecutor_arg: str, round_num: int = None):
         """Main entry point for the agent."""
         if self.status_callback:
             self.status_callback("🧠 Formulating defense strategy...")
         
-        result = self.dismantle_prosecution(model_data, prosecutor_arg)
+        result = self.dismantle_prosecution(model_data, prosecutor_arg, round_num)
         
         if self.status_callback:
             self.status_callback("✅ Strategy briefing ready.")
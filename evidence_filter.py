@@ -0,0 +1,175 @@
+import os
+import re
+import logging
+from dataclasses import dataclass
+from typing import List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Briefs are accumulated by the interface as "\nRound N: <argument>\n" blocks.
+ROUND_PATTERN = re.compile(r"^Round (\d+):", re.MULTILINE)
+SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+")
+WORD_PATTERN = re.compile(r"[a-z0-9']+")
+SUFFIX_PATTERN = re.compile(r"(ing|edly|ed|es|s|ly)$")
+
+# Function words carry no facts; dropping them lets paraphrased rounds register as repetition
+STOPWORDS = set("""
+a an the and or but if then than so as of to in on at by for from with without into onto over under
+about against between through during before after above below up down out off again further once
+is are was were be been being am do does did doing have has had having will would shall should can
+could may might must not no nor only own same too very just also even still yet
+i me my we our us you your he him his she her it its they them their this that these those there here
+who whom which what when where why how all any both each few more most other some such
+""".split())
+
+
+@dataclass
+class EvidenceThresholds:
+    """Tunable cut-offs for the local sufficiency pre-filter."""
+    min_rounds: int = 2               # Below this the answer is always NO
+    max_rounds: int = 0               # At or above this the answer is always YES (0 = no cap)
+    repetitive_below: float = 0.35    # Novelty at or below this -> YES (debate is going in circles)
+    ngram_size: int = 2               # Over content-word stems, so word order matters less
+    claim_similarity: float = 0.6     # Jaccard overlap at which a claim counts as fully restated
+    ngram_weight: float = 0.3
+    claim_weight: float = 0.7         # Restated claims matter more than reworded phrasing
+
+    @classmethod
+    def from_env(cls) -> "EvidenceThresholds":
+        """Builds thresholds, overriding defaults with EVIDENCE_* environment variables."""
+        thresholds = cls()
+        for field_name, default in vars(cls()).items():
+            raw = os.getenv(f"EVIDENCE_{field_name.upper()}")
+            if raw is None:
+                continue
+            try:
+                setattr(thresholds, field_name, type(default)(raw))
+            except ValueError:
+                logger.warning("Ignoring invalid EVIDENCE_%s=%r", field_name.upper(), raw)
+        return thresholds
+
+
+@dataclass
+class EvidenceDecision:
+    """Outcome of the pre-filter. `sufficient` is None when the LLM must decide."""
+    sufficient: Optional[bool]
+    novelty: float
+    reason: str
+
+
+def split_rounds(brief: str) -> List[str]:
+    """Splits an accumulated brief back into its per-round arguments."""
+    matches = list(ROUND_PATTERN.finditer(brief))
+    if not matches:
+        return [brief.strip()] if brief.strip() else []
+    rounds = []
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(brief)
+        rounds.append(brief[match.end():end].strip())
+    return rounds
+
+
+def _stem(word: str) -> str:
+    return SUFFIX_PATTERN.sub("", word) if len(word) > 4 else word
+
+
+def _tokens(text: str) -> List[str]:
+    """Content-word stems of `text`."""
+    return [_stem(w) for w in WORD_PATTERN.findall(text.lower()) if w not in STOPWORDS]
+
+
+def _ngrams(tokens: List[str], n: int) -> Set[Tuple[str, ...]]:
+    return {tuple(tokens[i:i + n]) for i in range(len(tokens) - n + 1)}
+
+
+def _claims(text: str) -> List[Set[str]]:
+    """Treats each reasonably long sentence as a claim, represented by its word set."""
+    claims = []
+    for sentence in SENTENCE_PATTERN.split(text):
+        words = set(_tokens(sentence))
+        if len(words) >= 3:
+            claims.append(words)
+    return claims
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def novelty_score(latest: str, earlier: List[str], thresholds: EvidenceThresholds) -> float:
+    """
+    Scores how much new content `latest` adds over `earlier`, from 0 (pure repetition)
+    to 1 (entirely new). Combines n-gram and claim novelty, scaled down when the
+    round is shorter than earlier ones.
+    """
+    latest_tokens = _tokens(latest)
+    if not latest_tokens:
+        return 0.0
+    if not earlier:
+        return 1.0
+
+    # 1. Share of the latest round's n-grams never seen before
+    latest_ngrams = _ngrams(latest_tokens, thresholds.ngram_size)
+    seen_ngrams = set()
+    for text in earlier:
+        seen_ngrams |= _ngrams(_tokens(text), thresholds.ngram_size)
+    ngram_novelty = len(latest_ngrams - seen_ngrams) / len(latest_ngrams) if latest_ngrams else 0.0
+
+    # 2. How far each claim is from its closest earlier claim; a claim overlapping
+    #    by claim_similarity or more counts as fully restated
+    latest_claims = _claims(latest)
+    earlier_claims = [c for text in earlier for c in _claims(text)]
+    if latest_claims:
+        claim_novelty = sum(
+            1.0 - min(max((_jaccard(c, old) for old in earlier_claims), default=0.0)
+                      / thresholds.claim_similarity, 1.0)
+            for c in latest_claims
+        ) / len(latest_claims)
+    else:
+        claim_novelty = 0.0
+
+    # 3. Length relative to the average earlier round (shrinking rounds add little)
+    earlier_avg = sum(len(_tokens(text)) for text in earlier) / len(earlier)
+    length_ratio = min(len(latest_tokens) / earlier_avg, 1.0) if earlier_avg else 1.0
+
+    total_weight = thresholds.ngram_weight + thresholds.claim_weight
+    content_novelty = (
+        thresholds.ngram_weight * ngram_novelty
+        + thresholds.claim_weight * claim_novelty
+    ) / total_weight
+    return content_novelty * length_ratio
+
+
+def prefilter_sufficiency(defense_brief: str, prosecution_brief: str,
+                          thresholds: EvidenceThresholds) -> EvidenceDecision:
+    """
+    Decides locally whether the judge has heard enough. Only clear cases are
+    settled here: NO before `min_rounds`, YES once both sides repeat themselves
+    or `max_rounds` (if set) is reached. Everything else returns `sufficient=None` so the
+    LLM decides; generated rounds rarely overlap enough to call a clear NO.
+    """
+    defense_rounds = split_rounds(defense_brief)
+    prosecution_rounds = split_rounds(prosecution_brief)
+    num_rounds = max(len(defense_rounds), len(prosecution_rounds))
+
+    if num_rounds < thresholds.min_rounds:
+        decision = EvidenceDecision(False, 1.0, f"only {num_rounds} round(s) heard")
+    elif thresholds.max_rounds and num_rounds >= thresholds.max_rounds:
+        decision = EvidenceDecision(True, 0.0, f"reached {num_rounds} rounds")
+    else:
+        scores = [
+            novelty_score(rounds[-1], rounds[:-1], thresholds)
+            for rounds in (defense_rounds, prosecution_rounds) if rounds
+        ]
+        # The debate only stalls once *both* sides stop adding material
+        novelty = max(scores)
+        if novelty <= thresholds.repetitive_below:
+            decision = EvidenceDecision(True, novelty, "latest round is repetitive")
+        else:
+            decision = EvidenceDecision(None, novelty, "not clearly repetitive, deferring to LLM")
+
+    logger.info("Evidence pre-filter: sufficient=%s novelty=%.2f rounds=%d (%s)",
+                decision.sufficient, decision.novelty, num_rounds, decision.reason)
+    return decision
@@ -1,17 +1,25 @@
 import streamlit as st
 import time
 import os
+import logging
+from collections import deque
 from dotenv import load_dotenv
 
-# Import the actual agent teams
-from defense_team import DefenseAttorneyAgent, DefenseStrategistAgent
-from prosecution_team import ProsecutorAgent, ProsecutionStrategistAgent
-from judge import JudgeAgent
-from utils import generate_content # Keep for CaseManager initial summary
+# Agent construction and round logic, shared with load_test.py
+from courtroom import CaseManager, build_agents, get_briefs, play_round
+from model_router import set_call_log
 
 # Load environment variables
 load_dotenv()
 
+# Show pre-filter, routing and token-budget decisions (LOG_LEVEL=WARNING to silence them)
+log_level = os.getenv("LOG_LEVEL", "INFO").upper()
+if not isinstance(logging.getLevelName(log_level), int):
+    log_level = "INFO"
+logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s: %(message)s")
+for logger_name in ("evidence_filter", "model_router", "judge"):
+    logging.getLogger(logger_name).setLevel(log_level)
+
 # Page Config
 st.set_page_config(page_title="AI Legal Debate Simulation", layout="wide", page_icon="⚖️")
 
@@ -41,36 +49,7 @@ def initialize_agents():
     
     # st.toast("Initializing Legal Teams...", icon="⚖️") # Removed to fix CacheReplayClosureError
     
-    # Defense Team (Gemini for Advocate, Groq for Strategist)
-    defense_attorney = DefenseAttorneyAgent(gemini_api_key=keys["gemini_1"], tavily_api_key=keys["tavily"])
-    defense_strategist = DefenseStrategistAgent(groq_api_key=keys["groq_1"], tavily_api_key=keys["tavily"])
-    
-    # Prosecution Team (Gemini for Prosecutor, Groq for Strategist)
-    prosecutor = ProsecutorAgent(gemini_api_key=keys["gemini_2"], tavily_api_key=keys["tavily"])
-    prosecution_strategist = ProsecutionStrategistAgent(groq_api_key=keys["groq_2"], tavily_api_key=keys["tavily"])
-    
-    # Judge (Groq + Tavily)
-    judge = JudgeAgent(groq_api_key=keys["groq_3"], tavily_api_key=keys["tavily"])
-    
-    return defense_attorney, defense_strategist, prosecutor, prosecution_strategist, judge
-
-# Helper for Case Summary (using simple utility function)
-class CaseManager:
-    def __init__(self, case_description):
-        self.case_description = case_description
-
-    def summarize_case(self):
-        prompt = f"""
-        Analyze the following legal case description and extract key facts. 
-        Provide a structured summary suitable for a legal debate.
-        
-        Case Description:
-        {self.case_description}
-        """
-        # Fallback to utils.generate_content (which uses a default key/model)
-        # Ideally this should also use one of the specific keys, but keeping as is for now
-        # assuming utils.py is configured correctly.
-        return generate_content(prompt)
+    return build_agents(keys)
 
 # --- MAIN INTERFACE ---
 st.title("⚖️ AI Courtroom: Prosecution vs Defense")
@@ -81,6 +60,9 @@ st.sidebar.title("Configuration")
 # num_rounds = st.sidebar.slider("Number of Rounds", 1, 3, 1) # Removed for interactive rounds
 
 # Session State
+if "routing_log" not in st.session_state:
+    st.session_state.routing_log = deque(maxlen=50)
+set_call_log(st.session_state.routing_log) # Agents are shared, so route records per session
 if "history" not in st.session_state:
     st.session_state.history = []
 if "case_summary" not in st.session_state:
@@ -118,21 +100,6 @@ if st.session_state.run_simulation and st.session_state.case_summary:
     if "verdict_text" not in st.session_state:
         st.session_state.verdict_text = None
 
-    # Helper: Accumulate Briefs
-    def get_briefs():
-        defense_brief = ""
-        prosecution_brief = ""
-        defense_strategy = ""
-        prosecution_strategy = ""
-        
-        for r in st.session_state.rounds:
-            defense_brief += f"\nRound {r['round']}: {r['defense_arg']}\n"
-            prosecution_brief += f"\nRound {r['round']}: {r['prosecution_arg']}\n"
-            defense_strategy += f"\nRound {r['round']}: {r['defense_strat']}\n"
-            prosecution_strategy += f"\nRound {r['round']}: {r['prosecution_strat']}\n"
-            
-        return defense_brief, prosecution_brief, defense_strategy, prosecution_strategy
-
     # --- RENDER EXISTING ROUNDS ---
     for r_data in st.session_state.rounds:
         st.markdown("---")
@@ -157,7 +124,7 @@ if st.session_state.run_simulation and st.session_state.case_summary:
     
     # 1. Check if Verdict is Ready (Auto-Trigger)
     if not st.session_state.verdict_ready and st.session_state.rounds:
-        d_brief, p_brief, _, _ = get_briefs()
+        d_brief, p_brief, _, _ = get_briefs(st.session_state.rounds)
         if judge.has_sufficient_evidence(d_brief, p_brief):
             st.session_state.verdict_ready = True
             st.info("🧑‍⚖️ The Judge has heard enough evidence to render a verdict.")
@@ -171,31 +138,10 @@ if st.session_state.run_simulation and st.session_state.case_summary:
             if st.button("Next Round ➡️", type="primary"):
                 round_num = len(st.session_state.rounds) + 1
                 
-                # Get previous context
-                d_brief, p_brief, _, _ = get_briefs()
-                
                 # Run Agents
                 with st.spinner(f"Running Round {round_num}..."):
-                    # Prosecution Turn
-                    if round_num == 1:
-                        p_strat = prosecution_strategist.strategize(st.session_state.case_summary, "Initial Opening Strategy")
-                        p_arg = prosecutor.prosecute(st.session_state.case_summary, "Opening Statement")
-                    else:
-                        p_strat = prosecution_strategist.strategize(st.session_state.case_summary, d_brief)
-                        p_arg = prosecutor.prosecute(st.session_state.case_summary, d_brief)
-                    
-                    # Defense Turn
-                    d_strat = defense_strategist.strategize(st.session_state.case_summary, p_arg)
-                    d_arg = defense_attorney.advocate(st.session_state.case_summary, p_arg)
-                    
-                    # Save Round Data
-                    st.session_state.rounds.append({
-                        "round": round_num,
-                        "prosecution_strat": p_strat,
-                        "prosecution_arg": p_arg,
-                        "defense_strat": d_strat,
-                        "defense_arg": d_arg
-                    })
+                    agents = (defense_attorney, defense_strategist, prosecutor, prosecution_strategist, judge)
+                    st.session_state.rounds.append(play_round(agents, st.session_state.case_summary, st.session_state.rounds))
                     st.rerun()
                     
         with col_verdict:
@@ -209,7 +155,7 @@ if st.session_state.run_simulation and st.session_state.case_summary:
         st.header("🧑‍⚖️ Final Verdict")
         
         if not st.session_state.verdict_text:
-            d_brief, p_brief, d_strat, p_strat = get_briefs()
+            d_brief, p_brief, d_strat, p_strat = get_briefs(st.session_state.rounds)
             with st.spinner("The Judge is deliberating (checking facts with Tavily)..."):
                 verdict = judge.deliberate(
                     defense_brief=d_brief,
@@ -224,3 +170,11 @@ if st.session_state.run_simulation and st.session_state.case_summary:
         if st.button("Start New Session"):
             st.session_state.clear()
             st.rerun()
+
+# Drawn last so it includes the calls made during this run
+with st.sidebar.expander("Model Routing", expanded=False):
+    for call in list(st.session_state.routing_log)[-10:]:
+        tokens = f" · {call['output_tokens']}/{call['max_tokens']} tok" if call.get("output_tokens") is not None else ""
+        tokens += " · cut off" if call.get("truncated") else ""
+        tokens += f" · failed ({call['error'][:80]})" if call.get("error") else ""
+        st.caption(f"{call['role']} · {call['task']} → {call['tier']} ({call['model']}){tokens}")
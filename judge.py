@@ -1,12 +1,31 @@
 import os
 import json
+import logging
+import threading
+from collections import OrderedDict
 from typing import List, Dict, Callable
-from langchain_groq import ChatGroq
+from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
 from tavily import TavilyClient
+from model_router import ModelRouter, is_truncated
+from evidence_filter import EvidenceThresholds, prefilter_sufficiency
+
+logger = logging.getLogger(__name__)
+
+
+class DisputedClaims(BaseModel):
+    """Factual claims in dispute between the two sides."""
+    claims: List[str] = Field(description="Up to 3 specific, verifiable factual claims, one short sentence each")
+
+
+class SufficiencyDecision(BaseModel):
+    """Whether the judge can render a verdict yet."""
+    sufficient: bool = Field(description="True if the arguments are sufficient to render a clear verdict")
+
 
 class JudgeAgent:
-    def __init__(self, groq_api_key: str, tavily_api_key: str, status_callback: Callable[[str], None] = None):
+    def __init__(self, groq_api_key: str, tavily_api_key: str, status_callback: Callable[[str], None] = None,
+                 evidence_thresholds: EvidenceThresholds = None):
         """
         Initializes the Judge Agent.
         
@@ -14,14 +33,21 @@ class JudgeAgent:
             groq_api_key: API key for Groq (Llama-3).
             tavily_api_key: API key for Tavily search.
             status_callback: Optional callback for status updates.
+            evidence_thresholds: Optional cut-offs for the local sufficiency pre-filter.
+                Defaults to values read from EVIDENCE_* environment variables.
         """
-        self.llm = ChatGroq(
-            temperature=0.1, # temperature for maximum objectivity
-            model="llama-3.3-70b-versatile", # High reasoning capability
-            groq_api_key=groq_api_key
+        self.router = ModelRouter(
+            provider="groq",
+            api_key=groq_api_key,
+            role="judge",
+            temperature=0.1 # temperature for maximum objectivity
         )
         self.tavily_client = TavilyClient(api_key=tavily_api_key)
         self.status_callback = status_callback
+        self.evidence_thresholds = evidence_thresholds or EvidenceThresholds.from_env()
+        # Streamlit reruns repeat the check with unchanged briefs; remember recent LLM answers
+        self._sufficiency_cache = OrderedDict()
+        self._sufficiency_lock = threading.Lock()
 
     def verify_key_claims(self, claims: List[str]) -> List[Dict]:
         """Fact-checks specific claims using Tavily."""
@@ -65,22 +91,17 @@ class JudgeAgent:
             ("user", """
             DEFENSE BRIEF: {defense_brief}
             PROSECUTION BRIEF: {prosecution_brief}
-            
-            Return ONLY a JSON list of strings, e.g. ["claim 1", "claim 2"]
             """)
         ])
         
         try:
-            extraction_chain = claim_extraction_prompt | self.llm
-            claims_json = extraction_chain.invoke({
+            extracted = self.router.invoke(claim_extraction_prompt, {
                 "defense_brief": defense_brief,
                 "prosecution_brief": prosecution_brief
-            }).content
-            # Cleanup json string if needed
-            if "```json" in claims_json:
-                claims_json = claims_json.split("```json")[1].split("```")[0]
-            claims_to_check = json.loads(claims_json)
-        except:
+            }, "extraction", defense_brief + prosecution_brief, schema=DisputedClaims)
+            claims_to_check = extracted.claims[:3]
+        except Exception as e:
+            logger.warning("Claim extraction failed, using fallback claims: %s", e)
             claims_to_check = ["safety compliance", "cost efficiency", "historical precedent"] # Fallback
 
         # Step 2: Verification
@@ -90,7 +111,6 @@ class JudgeAgent:
         if self.status_callback:
             self.status_callback("⚖️ Deliberating on the findings...")
 
-        # Step 3: Final Judgment
         # Step 3: Final Judgment
         judgment_prompt = ChatPromptTemplate.from_messages([
             ("system", """You are the Supreme Judge of Architectural Law.
@@ -100,6 +120,7 @@ class JudgeAgent:
             1. CONSENSUS CHECK: If the independent verification (Tavily) contradicts both sides or is inconclusive on safety critical issues, you MUST REFUSE to decide.
             2. SAFETY FIRST: Any confirmed safety violation is immediate grounds for ruling against the model.
             3. OBJECTIVITY: Ignore emotional appeals from the Defense or Prosecution.
+            4. LENGTH: Keep the whole report under 700 words. Keep each summary to 2-3 sentences so the Final Decision is always complete.
             
             Output your report in the following MarkDown format:
             
@@ -134,14 +155,25 @@ class JudgeAgent:
             Render your decision now:""")
         ])
 
-        judgment_chain = judgment_prompt | self.llm
-        verdict = judgment_chain.invoke({
+        judgment_inputs = {
             "defense_brief": defense_brief,
             "prosecution_brief": prosecution_brief,
             "defense_strategy": defense_strategy,
             "prosecution_strategy": prosecution_strategy,
             "verification_text": verification_text
-        }).content
+        }
+        judgment_text = defense_brief + prosecution_brief + defense_strategy + prosecution_strategy + verification_text
+        response = self.router.invoke(judgment_prompt, judgment_inputs, "judgment", judgment_text)
+
+        # A report cut off at the budget loses the Final Decision, so retry once with double the budget
+        if is_truncated(response):
+            budget = self.router.policy.max_tokens_for("judge", "judgment")
+            logger.warning("Judicial report was cut off at %s tokens, retrying with %s", budget, budget * 2)
+            response = self.router.invoke(judgment_prompt, judgment_inputs, "judgment", judgment_text,
+                                          max_tokens=budget * 2)
+        verdict = response.content
+        if is_truncated(response):
+            verdict += "\n\n⚠️ **The judicial report was cut off before completion; the Final Decision may be missing or incomplete.**"
         
         if self.status_callback:
             self.status_callback("✅ The Judge has reached a decision.")
@@ -151,7 +183,20 @@ class JudgeAgent:
     def has_sufficient_evidence(self, defense_brief: str, prosecution_brief: str) -> bool:
         """
         Determines if the judge has heard enough to render a verdict.
+        Clear cases are settled by a local novelty pre-filter; only ambiguous
+        ones are sent to the LLM.
         """
+        decision = prefilter_sufficiency(defense_brief, prosecution_brief, self.evidence_thresholds)
+        if decision.sufficient is not None:
+            return decision.sufficient
+
+        cache_key = (defense_brief, prosecution_brief)
+        with self._sufficiency_lock:
+            cached = self._sufficiency_cache.get(cache_key)
+        if cached is not None:
+            logger.info("Sufficiency check answered from cache: %s", cached)
+            return cached
+
         prompt = ChatPromptTemplate.from_messages([
             ("system", "You are a pragmatic Judge. Determine if the current arguments are sufficient to render a verdict or if more debate is needed."),
             ("user", """
@@ -159,15 +204,20 @@ class JudgeAgent:
             PROSECUTION BRIEF SO FAR: {prosecution_brief}
             
             Do you have enough information to make a clear decision?
-            Reply ONLY with 'YES' or 'NO'.
             """)
         ])
-        chain = prompt | self.llm
         try:
-            response = chain.invoke({
+            decision = self.router.invoke(prompt, {
                 "defense_brief": defense_brief,
                 "prosecution_brief": prosecution_brief
-            }).content.strip().upper()
-            return "YES" in response
-        except:
+            }, "classification", defense_brief + prosecution_brief, schema=SufficiencyDecision)
+        except Exception as e:
+            logger.warning("Sufficiency check failed, continuing the debate: %s", e)
             return False
+
+        # Agents are shared between sessions, so keep only the most recent answers
+        with self._sufficiency_lock:
+            self._sufficiency_cache[cache_key] = decision.sufficient
+            while len(self._sufficiency_cache) > 32:
+                self._sufficiency_cache.popitem(last=False)
+        return decision.sufficient
@@ -0,0 +1,654 @@
+"""
+Load-test harness for the courtroom simulation.
+
+Runs the app's own code (courtroom.build_agents, CaseManager, play_round,
+JudgeAgent.has_sufficient_evidence and deliberate) from N concurrent session
+threads against local stand-in Groq, Gemini and Tavily servers. Like
+st.cache_resource, one set of agents is built once and shared by every session,
+and each session follows the interface's rerun flow: the sufficiency check runs
+on every rerun, trials stop when the judge says YES (or the user asks for the
+verdict after --max-rounds), and users pause between rounds.
+
+The stand-ins model latency per model tier, per-key/model rate limits (HTTP 429
+with Retry-After), a finite number of serving slots, server errors and replies
+cut off at max_tokens. The clients are pointed at them through GROQ_API_BASE,
+GEMINI_API_BASE and the Tavily client's base_url, so no API keys are used.
+
+Requires the app's dependencies (requirements.txt). All durations are reported
+in simulated seconds; --time-scale shrinks wall-clock time. Each session
+thread's own CPU work (prompt building, HTTP clients, parsing) is measured
+separately and counted unscaled, so a small --time-scale does not inflate it;
+contention between session threads for the GIL still shows up as scaled
+waiting, so keep --time-scale at 0.02 or above. Client-side retry backoff
+(e.g. langchain-google-genai's) is not scaled, so use --time-scale 1 when 429
+behaviour matters. One unrecorded warm-up trial per agent set runs before the
+first level, so that level does not pay for client setup and first imports.
+
+Usage:
+    python load_test.py --concurrency 1,2,4,8,16 --trials 2 --time-scale 0.05
+    python load_test.py --concurrency 8 --groq-rpm 60 --key-pool 4 --json results.json
+"""
+import argparse
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from courtroom import CaseManager, build_agents, get_briefs, play_round
+from model_router import MODEL_TIERS
+
+MODEL_TIER_LOOKUP = {model: tier for tiers in MODEL_TIERS.values() for tier, model in tiers.items()}
+
+SAMPLE_CASES = [
+    "The defendant is accused of burglary after a neighbour reported seeing him near the house at midnight.",
+    "A delivery driver is charged with reckless driving after a collision at a school crossing.",
+    "A bookkeeper is accused of embezzling funds from a charity over three years.",
+    "A tenant is charged with arson after a fire started in the basement storage room.",
+]
+
+# Stand-in replies are stitched from these, so later rounds repeat earlier material the way real debates do
+SENTENCES = [
+    "The only eyewitness saw the suspect from forty metres away at night.",
+    "No fingerprints belonging to the accused were found on the weapon.",
+    "The accused's sister states that he was at her home all evening.",
+    "Phone records place the defendant two streets from the scene at 10:42pm.",
+    "The prosecution has not established a motive beyond speculation.",
+    "A pawn shop receipt shows a watch belonging to the victim was sold the next day.",
+    "The forensic report was filed three weeks late and lacks a chain of custody.",
+    "Security footage from the corner shop shows a figure matching the defendant's build.",
+    "The defence has offered no independent corroboration of the alibi.",
+    "Reasonable doubt remains as to the timeline presented by the state.",
+    "The victim's statement changed twice between the first and second interviews.",
+    "The defendant had previously threatened the victim over an unpaid debt.",
+    "Expert testimony on the blood spatter pattern is contested by both sides.",
+    "The arresting officer did not record the search in the station log.",
+    "Character witnesses describe the accused as non-violent and reliable.",
+    "The timeline leaves a twenty-minute window that neither side has explained.",
+]
+
+logger = logging.getLogger("load_test")
+
+
+class Clock:
+    """Converts between simulated seconds and wall-clock seconds."""
+
+    def __init__(self, scale: float):
+        self.scale = scale
+
+    def sleep(self, seconds: float):
+        time.sleep(seconds * self.scale)
+
+    def now(self) -> float:
+        return time.monotonic() / self.scale
+
+    def mark(self) -> Tuple[float, float]:
+        """Wall-clock and current-thread CPU time, to pass to since()."""
+        return time.monotonic(), time.thread_time()
+
+    def since(self, mark: Tuple[float, float]) -> float:
+        """
+        Simulated seconds since `mark` on the calling thread. Waiting is scaled;
+        the thread's own CPU work ran at real speed, so it is counted unscaled.
+        """
+        wall_started, cpu_started = mark
+        cpu = time.thread_time() - cpu_started
+        wall = time.monotonic() - wall_started
+        return max(wall - cpu, 0.0) / self.scale + cpu
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+# --- STAND-IN SERVERS ---
+class RateLimiter:
+    """Sliding one-minute window of requests per bucket."""
+
+    def __init__(self, rpm: int, clock: Clock):
+        self.rpm = rpm
+        self.clock = clock
+        self.calls = defaultdict(deque)
+        self.lock = threading.Lock()
+
+    def acquire(self, bucket) -> float:
+        """Returns 0 if the request is admitted, otherwise simulated seconds until it would be."""
+        if self.rpm <= 0:
+            return 0.0
+        with self.lock:
+            now = self.clock.now()
+            window = self.calls[bucket]
+            while window and now - window[0] >= 60:
+                window.popleft()
+            if len(window) >= self.rpm:
+                return 60 - (now - window[0])
+            window.append(now)
+            return 0.0
+
+    def reset(self):
+        with self.lock:
+            self.calls.clear()
+
+
+class StandInServer(ThreadingHTTPServer):
+    """Serves one backend ('groq', 'gemini' or 'tavily') and logs every request it sees."""
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, backend: str, args, clock: Clock):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.backend = backend
+        self.args = args
+        self.clock = clock
+        self.limiter = RateLimiter(getattr(args, f"{backend}_rpm"), clock)
+        self.slots = threading.BoundedSemaphore(getattr(args, f"{backend}_slots"))
+        self.error_rate = getattr(args, f"{backend}_error_rate")
+        self.requests = []
+        self.lock = threading.Lock()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def log_request_outcome(self, status: int, queue_delay: float = 0.0, service_time: float = 0.0):
+        with self.lock:
+            self.requests.append({"status": status, "queue_delay": queue_delay, "service_time": service_time})
+
+    def drain(self) -> List[Dict]:
+        with self.lock:
+            requests, self.requests = self.requests, []
+        return requests
+
+    def llm_reply(self, model: str, input_tokens: int, max_tokens: int, structured: bool) -> Tuple[float, int, bool]:
+        """Simulated service time, generated tokens and whether the reply hit max_tokens."""
+        args = self.args
+        truncated = False
+        if structured:
+            output_tokens = random.randint(10, 60)
+        elif random.random() < args.truncation_rate:
+            output_tokens, truncated = max_tokens, True
+        else:
+            output_tokens = int(max_tokens * random.uniform(0.5, 0.95))
+        tier = MODEL_TIER_LOOKUP.get(model, "large")
+        per_token = args.small_ms_per_token if tier == "small" else args.large_ms_per_token
+        seconds = (args.llm_base_latency
+                   + input_tokens * args.prefill_ms_per_token / 1000
+                   + output_tokens * per_token / 1000)
+        return seconds * random.uniform(0.8, 1.2), output_tokens, truncated
+
+
+def fake_text(output_tokens: int) -> str:
+    words, sentences = 0, []
+    while words < output_tokens * 0.75:
+        sentence = random.choice(SENTENCES)
+        sentences.append(sentence)
+        words += len(sentence.split())
+    return " ".join(sentences)
+
+
+def fake_arguments(schema: Dict, yes_rate: float) -> Dict:
+    """Fills a JSON schema (a structured-output tool) with plausible values."""
+    values = {}
+    for name, spec in schema.get("properties", {}).items():
+        kind = spec.get("type")
+        if kind == "boolean":
+            values[name] = random.random() < yes_rate
+        elif kind == "array":
+            values[name] = random.sample(SENTENCES, 3)
+        elif kind in ("integer", "number"):
+            values[name] = 1
+        else:
+            values[name] = random.choice(SENTENCES)
+    return values
+
+
+def message_text(content) -> str:
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict, retry_after: float = None):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        if retry_after is not None:
+            # Clients sleep in wall-clock time
+            self.send_header("Retry-After", f"{retry_after * self.server.clock.scale:.3f}")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _error(self, status: int, message: str, retry_after: float = None):
+        backend = self.server.backend
+        if backend == "gemini":
+            body = {"error": {"code": status, "message": message,
+                              "status": "RESOURCE_EXHAUSTED" if status == 429 else "INTERNAL"}}
+        elif backend == "groq":
+            body = {"error": {"message": message, "type": "requests", "code": "rate_limit_exceeded"
+                              if status == 429 else "internal_server_error"}}
+        else:
+            body = {"detail": {"error": message}}
+        self.server.log_request_outcome(status)
+        self._reply(status, body, retry_after)
+
+    def _api_key(self, payload: dict) -> str:
+        query = parse_qs(urlparse(self.path).query)
+        return (self.headers.get("Authorization") or self.headers.get("x-goog-api-key")
+                or query.get("key", [""])[0] or payload.get("api_key", ""))
+
+    def do_POST(self):
+        server = self.server
+        payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        if server.backend == "gemini":
+            match = re.search(r"models/([^/:]+):generateContent", self.path)
+            model = match.group(1) if match else "unknown"
+        else:
+            model = payload.get("model", server.backend)
+
+        # Groq and Gemini limit per key and model; Tavily per key
+        retry_after = server.limiter.acquire((self._api_key(payload), model))
+        if retry_after:
+            self._error(429, "Rate limit reached, please retry later", retry_after)
+            return
+
+        queued_at = server.clock.now()
+        with server.slots:
+            queue_delay = server.clock.now() - queued_at
+            if server.backend == "tavily":
+                service_time = random.uniform(*server.args.tavily_latency)
+                server.clock.sleep(service_time)
+                body = {"query": payload.get("query", ""), "response_time": service_time, "results": [
+                    {"title": "Stand-in result", "url": "http://127.0.0.1/result", "score": 0.9,
+                     "content": fake_text(120)} for _ in range(payload.get("max_results", 3))]}
+            elif server.backend == "groq":
+                service_time, body = self._groq_completion(payload, model)
+            else:
+                service_time, body = self._gemini_completion(payload, model)
+
+        if random.random() < server.error_rate:
+            self._error(500, "Internal server error", 1.0)
+            return
+        server.log_request_outcome(200, queue_delay, service_time)
+        self._reply(200, body)
+
+    def _groq_completion(self, payload: dict, model: str) -> Tuple[float, dict]:
+        """OpenAI-style chat completion, including tool calls and json_schema replies for structured output."""
+        server = self.server
+        input_tokens = sum(len(message_text(m.get("content"))) for m in payload.get("messages", [])) // 4
+        max_tokens = payload.get("max_tokens") or payload.get("max_completion_tokens") or 1024
+        tools = payload.get("tools") or []
+        json_schema = (payload.get("response_format") or {}).get("json_schema", {}).get("schema")
+        structured = bool(tools or json_schema)
+        service_time, output_tokens, truncated = server.llm_reply(model, input_tokens, max_tokens, structured)
+        server.clock.sleep(service_time)
+
+        message, finish_reason = {"role": "assistant", "content": None}, "stop"
+        if tools:
+            function = tools[0]["function"]
+            arguments = fake_arguments(function.get("parameters", {}), server.args.yes_rate)
+            message["tool_calls"] = [{"id": f"call_{uuid.uuid4().hex[:8]}", "type": "function",
+                                      "function": {"name": function["name"], "arguments": json.dumps(arguments)}}]
+            finish_reason = "tool_calls"
+        elif json_schema:
+            message["content"] = json.dumps(fake_arguments(json_schema, server.args.yes_rate))
+        else:
+            message["content"] = fake_text(output_tokens)
+            finish_reason = "length" if truncated else "stop"
+        return service_time, {
+            "id": f"chatcmpl-{uuid.uuid4().hex}", "object": "chat.completion", "created": int(time.time()),
+            "model": model, "system_fingerprint": "stand-in",
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason, "logprobs": None}],
+            "usage": {"prompt_tokens": input_tokens, "completion_tokens": output_tokens,
+                      "total_tokens": input_tokens + output_tokens},
+        }
+
+    def _gemini_completion(self, payload: dict, model: str) -> Tuple[float, dict]:
+        """Gemini REST generateContent reply."""
+        server = self.server
+        input_tokens = sum(len(part.get("text", "")) for content in payload.get("contents", [])
+                           for part in content.get("parts", [])) // 4
+        max_tokens = (payload.get("generationConfig") or payload.get("generation_config") or {}).get(
+            "maxOutputTokens") or 1024
+        service_time, output_tokens, truncated = server.llm_reply(model, input_tokens, max_tokens, False)
+        server.clock.sleep(service_time)
+        return service_time, {
+            "candidates": [{"content": {"parts": [{"text": fake_text(output_tokens)}], "role": "model"},
+                            "finishReason": "MAX_TOKENS" if truncated else "STOP", "index": 0}],
+            "usageMetadata": {"promptTokenCount": input_tokens, "candidatesTokenCount": output_tokens,
+                              "totalTokenCount": input_tokens + output_tokens},
+            "modelVersion": model,
+        }
+
+
+# --- SIMULATED SESSIONS ---
+class Metrics:
+    def __init__(self):
+        self.stages = []
+        self.trials = []
+        self.failures = []
+        self.lock = threading.Lock()
+
+    def record_stage(self, stage: str, latency: float, error: str = None):
+        with self.lock:
+            self.stages.append({"stage": stage, "latency": latency, "error": error})
+
+    def record_trial(self, seconds: float, rounds: int):
+        with self.lock:
+            self.trials.append({"seconds": seconds, "rounds": rounds})
+
+    def record_failure(self, error: str):
+        with self.lock:
+            self.failures.append(error)
+
+
+class StageTimer:
+    """Times calls to the shared agents' methods into the current level's Metrics."""
+
+    def __init__(self, clock: Clock):
+        self.clock = clock
+        self.metrics = Metrics()
+
+    def wrap(self, stage: str, method):
+        def timed(*args, **kwargs):
+            started = self.clock.mark()
+            try:
+                result = method(*args, **kwargs)
+            except Exception as e:
+                self.metrics.record_stage(stage, self.clock.since(started), type(e).__name__)
+                raise
+            # Agents (and utils.generate_content) report most failures as text instead of raising
+            failed = isinstance(result, str) and result.startswith(("❌", "Error generating content"))
+            error = "agent_error" if failed else None
+            self.metrics.record_stage(stage, self.clock.since(started), error)
+            return result
+        return timed
+
+
+def build_agent_sets(args, servers: Dict[str, StandInServer], timer: StageTimer) -> List[tuple]:
+    """Builds --key-pool agent sets (one, like st.cache_resource, by default) wired to the stand-ins."""
+    os.environ["GROQ_API_BASE"] = servers["groq"].url
+    os.environ["GEMINI_API_BASE"] = servers["gemini"].url
+    # utils.generate_content (the clerk) reads its key from the environment
+    os.environ.pop("GEMINI_API_KEY", None)
+    os.environ["GEMINI_API_KEY1"] = "gemini_1-loadtest-0"
+
+    agent_sets = []
+    for pool_index in range(args.key_pool):
+        keys = {name: f"{name}-loadtest-{pool_index}"
+                for name in ("gemini_1", "gemini_2", "groq_1", "groq_2", "groq_3", "tavily")}
+        agents = build_agents(keys)
+        defense_attorney, defense_strategist, prosecutor, prosecution_strategist, judge = agents
+        for agent in agents:
+            agent.tavily_client.base_url = servers["tavily"].url
+        defense_attorney.advocate = timer.wrap("defense_attorney.advocate", defense_attorney.advocate)
+        defense_strategist.strategize = timer.wrap("defense_strategist.strategize", defense_strategist.strategize)
+        prosecutor.prosecute = timer.wrap("prosecutor.prosecute", prosecutor.prosecute)
+        prosecution_strategist.strategize = timer.wrap("prosecution_strategist.strategize",
+                                                       prosecution_strategist.strategize)
+        judge.has_sufficient_evidence = timer.wrap("judge.has_sufficient_evidence", judge.has_sufficient_evidence)
+        judge.verify_key_claims = timer.wrap("judge.verify_key_claims", judge.verify_key_claims)
+        judge.deliberate = timer.wrap("judge.deliberate", judge.deliberate)
+        agent_sets.append(agents)
+    return agent_sets
+
+
+class Session(threading.Thread):
+    """One user clicking through trials, following interface.py's script reruns."""
+
+    def __init__(self, index: int, args, clock: Clock, agents: tuple, timer: StageTimer):
+        super().__init__(daemon=True)
+        self.index = index
+        self.args = args
+        self.clock = clock
+        self.agents = agents
+        self.timer = timer
+        self.elapsed = 0.0
+
+    def think(self):
+        self.clock.sleep(random.uniform(*self.args.think_time))
+
+    def sufficient(self, rounds: List[Dict]) -> bool:
+        # Every script run with rounds and no verdict yet starts with this check
+        d_brief, p_brief, _, _ = get_briefs(rounds)
+        return self.agents[-1].has_sufficient_evidence(d_brief, p_brief)
+
+    def run_trial(self):
+        judge = self.agents[-1]
+        summarize = self.timer.wrap("clerk.summarize_case", CaseManager(random.choice(SAMPLE_CASES)).summarize_case)
+        case_summary = summarize()
+        rounds = []
+
+        while True:
+            self.think()
+            # Clicking a button reruns the script, which checks sufficiency before handling the click
+            if rounds and self.sufficient(rounds):
+                break
+            if len(rounds) >= self.args.max_rounds:
+                break  # The user clicks "Show Verdict"
+            rounds.append(play_round(self.agents, case_summary, rounds))
+            # st.rerun() after the round runs the check again
+            if self.sufficient(rounds):
+                break
+
+        d_brief, p_brief, d_strat, p_strat = get_briefs(rounds)
+        judge.deliberate(defense_brief=d_brief, prosecution_brief=p_brief,
+                         defense_strategy=d_strat, prosecution_strategy=p_strat)
+        return len(rounds)
+
+    def run(self):
+        session_started = self.clock.mark()
+        self.clock.sleep(random.uniform(0, self.args.think_time[1]))
+        for _ in range(self.args.trials):
+            started = self.clock.mark()
+            try:
+                rounds = self.run_trial()
+            except Exception as e:
+                # The app would show a Streamlit error and the user would start over
+                self.timer.metrics.record_failure(type(e).__name__)
+                logger.debug("Session %d trial failed", self.index, exc_info=True)
+                continue
+            self.timer.metrics.record_trial(self.clock.since(started), rounds)
+        self.elapsed = self.clock.since(session_started)
+
+
+# --- REPORTING ---
+def summarize(concurrency: int, elapsed: float, metrics: Metrics, backends: Dict[str, List[Dict]]) -> dict:
+    stages = defaultdict(list)
+    for call in metrics.stages:
+        stages[call["stage"]].append(call)
+    trial_seconds = [t["seconds"] for t in metrics.trials]
+    failure_types = defaultdict(int)
+    for error in metrics.failures:
+        failure_types[error] += 1
+    return {
+        "concurrency": concurrency,
+        "elapsed": elapsed,
+        "trials": len(metrics.trials),
+        "failed_trials": len(metrics.failures),
+        "failure_types": dict(failure_types),
+        "trials_per_min": len(metrics.trials) / elapsed * 60 if elapsed else 0.0,
+        "avg_rounds": sum(t["rounds"] for t in metrics.trials) / len(metrics.trials) if metrics.trials else 0.0,
+        "rounds_per_min": sum(t["rounds"] for t in metrics.trials) / elapsed * 60 if elapsed else 0.0,
+        "trial_p50": percentile(trial_seconds, 50),
+        "trial_p95": percentile(trial_seconds, 95),
+        "stages": {
+            stage: {
+                "calls": len(items),
+                "p50": percentile([c["latency"] for c in items], 50),
+                "p95": percentile([c["latency"] for c in items], 95),
+                "p99": percentile([c["latency"] for c in items], 99),
+                "errors": sum(1 for c in items if c["error"]),
+            }
+            for stage, items in sorted(stages.items())
+        },
+        "backends": {
+            backend: {
+                "requests": len(requests),
+                "requests_per_sec": len(requests) / elapsed if elapsed else 0.0,
+                "rate_429": sum(1 for r in requests if r["status"] == 429) / len(requests) if requests else 0.0,
+                "rate_5xx": sum(1 for r in requests if r["status"] >= 500) / len(requests) if requests else 0.0,
+                "queue_p50": percentile([r["queue_delay"] for r in requests if r["status"] == 200], 50),
+                "queue_p95": percentile([r["queue_delay"] for r in requests if r["status"] == 200], 95),
+                "service_p50": percentile([r["service_time"] for r in requests if r["status"] == 200], 50),
+            }
+            for backend, requests in backends.items()
+        },
+    }
+
+
+def print_level(result: dict):
+    failures = ", ".join(f"{k} x{v}" for k, v in result["failure_types"].items()) or "none"
+    print(f"\n=== {result['concurrency']} sessions: {result['trials']} trials in {result['elapsed']:.1f}s "
+          f"| {result['trials_per_min']:.2f} trials/min | {result['avg_rounds']:.1f} rounds/trial "
+          f"| failed trials: {failures}")
+    print(f"{'stage':<38}{'calls':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'errors':>8}")
+    for stage, s in result["stages"].items():
+        print(f"{stage:<38}{s['calls']:>7}{s['p50']:>9.2f}{s['p95']:>9.2f}{s['p99']:>9.2f}{s['errors']:>8}")
+    print(f"{'backend':<10}{'requests':>10}{'req/s':>8}{'429s':>8}{'5xx':>8}{'queue p50':>11}{'queue p95':>11}"
+          f"{'service p50':>13}")
+    for backend, b in result["backends"].items():
+        print(f"{backend:<10}{b['requests']:>10}{b['requests_per_sec']:>8.2f}{b['rate_429']:>8.1%}"
+              f"{b['rate_5xx']:>8.1%}{b['queue_p50']:>11.2f}{b['queue_p95']:>11.2f}{b['service_p50']:>13.2f}")
+
+
+def print_summary(results: list):
+    first = results[0]
+    # Rounds, not trials: the judge ends trials after a varying number of rounds
+    baseline = first["rounds_per_min"] / first["concurrency"] if first["rounds_per_min"] else 0
+    print("\n=== Scaling summary (efficiency = rounds/min per session vs. the first level)")
+    print(f"{'sessions':>8}{'trials/min':>12}{'rounds/min':>12}{'efficiency':>12}{'trial p50':>11}{'trial p95':>11}"
+          f"{'failed':>8}{'groq 429s':>11}{'gemini 429s':>13}")
+    for r in results:
+        efficiency = r["rounds_per_min"] / r["concurrency"] / baseline if baseline else 0
+        print(f"{r['concurrency']:>8}{r['trials_per_min']:>12.2f}{r['rounds_per_min']:>12.2f}{efficiency:>12.0%}{r['trial_p50']:>11.1f}"
+              f"{r['trial_p95']:>11.1f}{r['failed_trials']:>8}{r['backends']['groq']['rate_429']:>11.1%}"
+              f"{r['backends']['gemini']['rate_429']:>13.1%}")
+
+
+def run_level(concurrency: int, args, clock: Clock, agent_sets: List[tuple], timer: StageTimer,
+              servers: Dict[str, StandInServer]) -> dict:
+    timer.metrics = Metrics()
+    for server in servers.values():
+        server.drain()
+        server.limiter.reset()  # Each level starts with empty rate-limit windows
+    sessions = [Session(i, args, clock, agent_sets[i % len(agent_sets)], timer) for i in range(concurrency)]
+    for session in sessions:
+        session.start()
+    for session in sessions:
+        session.join()
+    # Sessions start together, so the level lasts as long as the slowest one
+    elapsed = max(session.elapsed for session in sessions)
+    return summarize(concurrency, elapsed, timer.metrics,
+                     {name: server.drain() for name, server in servers.items()})
+
+
+def warm_up(args, clock: Clock, agent_sets: List[tuple], timer: StageTimer, servers: Dict[str, StandInServer]):
+    """Runs one unrecorded trial per agent set without think time, then clears what it left behind."""
+    warm_args = argparse.Namespace(**{**vars(args), "think_time": (0.0, 0.0)})
+    for i, agents in enumerate(agent_sets):
+        try:
+            Session(i, warm_args, clock, agents, timer).run_trial()
+        except Exception:
+            logger.debug("Warm-up trial failed", exc_info=True)
+    timer.metrics = Metrics()
+    for server in servers.values():
+        server.drain()
+        server.limiter.reset()
+
+
+def parse_range(value: str):
+    low, _, high = value.partition(",")
+    return float(low), float(high or low)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    load = parser.add_argument_group("load")
+    load.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated session counts to step through")
+    load.add_argument("--trials", type=int, default=1, help="Trials per session")
+    load.add_argument("--max-rounds", type=int, default=5,
+                      help="Rounds after which the user clicks 'Show Verdict' if the judge has not stopped the trial")
+    load.add_argument("--think-time", type=parse_range, default=(5.0, 20.0),
+                      help="Pause before each click as 'min,max' seconds")
+    load.add_argument("--key-pool", type=int, default=1,
+                      help="Agent sets with distinct keys; sessions are spread across them (1 = the app today)")
+    load.add_argument("--time-scale", type=float, default=0.05,
+                      help="Wall-clock seconds per simulated second (0.02 or above keeps GIL contention small)")
+    load.add_argument("--no-warm-up", action="store_true", help="Skip the unrecorded warm-up trial")
+    load.add_argument("--seed", type=int, default=None)
+    load.add_argument("--json", help="Write the full results to this file")
+    load.add_argument("--verbose", action="store_true", help="Show the app's own pre-filter and routing logs")
+
+    llm = parser.add_argument_group("stand-in LLM servers")
+    llm.add_argument("--groq-rpm", type=int, default=30, help="Requests per minute per key and model (0 = unlimited)")
+    llm.add_argument("--gemini-rpm", type=int, default=15, help="Requests per minute per key and model (0 = unlimited)")
+    llm.add_argument("--groq-slots", type=int, default=32, help="Requests served concurrently before queueing")
+    llm.add_argument("--gemini-slots", type=int, default=32, help="Requests served concurrently before queueing")
+    llm.add_argument("--llm-base-latency", type=float, default=0.3, help="Fixed seconds per request")
+    llm.add_argument("--prefill-ms-per-token", type=float, default=0.2)
+    llm.add_argument("--small-ms-per-token", type=float, default=4.0)
+    llm.add_argument("--large-ms-per-token", type=float, default=12.0)
+    llm.add_argument("--groq-error-rate", type=float, default=0.0)
+    llm.add_argument("--gemini-error-rate", type=float, default=0.0)
+    llm.add_argument("--truncation-rate", type=float, default=0.02,
+                     help="Share of free-text replies cut off at max_tokens")
+    llm.add_argument("--yes-rate", type=float, default=0.4,
+                     help="Share of LLM sufficiency checks the stand-in judge answers YES")
+
+    search = parser.add_argument_group("stand-in search server")
+    search.add_argument("--tavily-rpm", type=int, default=100, help="Requests per minute per key (0 = unlimited)")
+    search.add_argument("--tavily-slots", type=int, default=16)
+    search.add_argument("--tavily-latency", type=parse_range, default=(1.0, 3.0), help="'min,max' seconds")
+    search.add_argument("--tavily-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s: %(message)s",
+                        level=logging.INFO if args.verbose else logging.ERROR)
+    logger.setLevel(logging.INFO if args.verbose else logging.WARNING)  # The harness's own warnings always show
+    if args.seed is not None:
+        random.seed(args.seed)
+    if args.time_scale < 0.02:
+        logger.warning("--time-scale %s is small: GIL contention between sessions is scaled up "
+                       "with the simulated waits and will inflate latencies", args.time_scale)
+    clock = Clock(args.time_scale)
+    servers = {backend: StandInServer(backend, args, clock) for backend in ("groq", "gemini", "tavily")}
+    for server in servers.values():
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    timer = StageTimer(clock)
+    agent_sets = build_agent_sets(args, servers, timer)
+    results = []
+    try:
+        if not args.no_warm_up:
+            warm_up(args, clock, agent_sets, timer, servers)
+        for concurrency in [int(c) for c in args.concurrency.split(",")]:
+            result = run_level(concurrency, args, clock, agent_sets, timer, servers)
+            print_level(result)
+            results.append(result)
+    finally:
+        for server in servers.values():
+            server.shutdown()
+
+    print_summary(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+import os
+import logging
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Type
+from langchain_groq import ChatGroq
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+logger = logging.getLogger(__name__)
+
+# Where the current session's routing records go. Agents are shared between
+# sessions, so each session's script run points this at its own list.
+_call_log: ContextVar = ContextVar("call_log", default=None)
+
+# Models available per provider, by tier
+MODEL_TIERS = {
+    "groq": {
+        "small": "llama-3.1-8b-instant",     # Fast, good enough for extraction / YES-NO
+        "large": "llama-3.3-70b-versatile",  # High reasoning capability
+    },
+    "gemini": {
+        "small": "gemini-2.5-flash-lite",
+        "large": "gemini-2.5-flash",
+    },
+}
+
+# Default tier per task type
+TASK_TIERS = {
+    "extraction": "small",      # Pulling disputed claims out of the briefs
+    "classification": "small",  # YES/NO sufficiency check
+    "strategy": "large",        # Strategist breakdowns (early rounds are downgraded)
+    "advocacy": "small",        # Advocate speeches
+    "judgment": "large",        # Final verdict
+}
+
+# Default output token cap per task type
+OUTPUT_TOKEN_BUDGETS = {
+    "extraction": 256,      # Three short claims as a structured reply
+    "classification": 64,   # Single boolean as a structured reply
+    "strategy": 700,        # Prompts ask for under 400 words
+    "advocacy": 550,        # 300-350 words plus headroom
+    "judgment": 1200,       # Full markdown judicial report, prompt asks for under 700 words
+}
+
+
+@dataclass
+class RoutingPolicy:
+    """Assigns a model tier to each call by role, task type and input size."""
+    task_tiers: Dict[str, str] = field(default_factory=lambda: dict(TASK_TIERS))
+    role_overrides: Dict[str, Dict[str, str]] = field(default_factory=dict)
+    output_budgets: Dict[str, int] = field(default_factory=lambda: dict(OUTPUT_TOKEN_BUDGETS))
+    role_budget_overrides: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    early_rounds: int = 1               # Strategy calls up to this round use the small tier
+    small_max_input_tokens: int = 6000  # Larger inputs are escalated to the large tier
+
+    @classmethod
+    def from_env(cls) -> "RoutingPolicy":
+        """
+        Builds the default policy, applying overrides such as
+        MODEL_TIER_JUDGE_EXTRACTION=large or MAX_TOKENS_PROSECUTOR_ADVOCACY=600
+        from the environment.
+        """
+        policy = cls()
+        for key, value in os.environ.items():
+            if key.startswith("MAX_TOKENS_"):
+                role, _, task = key[len("MAX_TOKENS_"):].lower().rpartition("_")
+                if role and task and value.strip().isdigit() and int(value) > 0:
+                    policy.role_budget_overrides.setdefault(role, {})[task] = int(value)
+                else:
+                    logger.warning("Ignoring invalid %s=%r (expected MAX_TOKENS_<ROLE>_<TASK>=<positive int>)",
+                                   key, value)
+                continue
+            if not key.startswith("MODEL_TIER_"):
+                continue
+            value = value.strip().lower()
+            if value not in ("small", "large"):
+                logger.warning("Ignoring invalid %s=%r", key, value)
+                continue
+            # Role names may contain underscores, task names do not
+            role, _, task = key[len("MODEL_TIER_"):].lower().rpartition("_")
+            if role and task:
+                policy.role_overrides.setdefault(role, {})[task] = value
+            else:
+                logger.warning("Ignoring %s: expected MODEL_TIER_<ROLE>_<TASK>", key)
+        for key, attr in (("MODEL_EARLY_ROUNDS", "early_rounds"),
+                          ("MODEL_SMALL_MAX_INPUT_TOKENS", "small_max_input_tokens")):
+            raw = os.getenv(key)
+            if raw is None:
+                continue
+            try:
+                setattr(policy, attr, int(raw))
+            except ValueError:
+                logger.warning("Ignoring invalid %s=%r", key, raw)
+        return policy
+
+    def select_tier(self, role: str, task: str, input_tokens: int = 0, round_num: Optional[int] = None) -> str:
+        """Returns 'small' or 'large' for the given call."""
+        override = self.role_overrides.get(role, {}).get(task)
+        if override:
+            return override
+
+        tier = self.task_tiers.get(task, "large")
+        if task == "strategy" and round_num is not None and round_num <= self.early_rounds:
+            tier = "small"
+        if tier == "small" and input_tokens > self.small_max_input_tokens:
+            tier = "large"
+        return tier
+
+    def max_tokens_for(self, role: str, task: str) -> Optional[int]:
+        """Returns the output token cap for the given call, or None if uncapped."""
+        override = self.role_budget_overrides.get(role, {}).get(task)
+        if override:
+            return override
+        return self.output_budgets.get(task)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token)."""
+    return len(text) // 4
+
+
+def is_truncated(message) -> bool:
+    """True if the reply stopped because it hit its output token cap."""
+    metadata = getattr(message, "response_metadata", None) or {}
+    reason = metadata.get("finish_reason") or metadata.get("stop_reason")
+    return str(reason).lower() in ("length", "max_tokens", "finishreason.max_tokens")
+
+
+def set_call_log(log):
+    """Records every routed call made from the current context into `log` (e.g. a deque)."""
+    _call_log.set(log)
+
+
+def record_call(record: Dict[str, Any]):
+    """Appends a call record to the current context's call log, if one is set."""
+    call_log = _call_log.get()
+    if call_log is not None:
+        call_log.append(record)
+
+
+def report_usage(record: Dict[str, Any]):
+    """Logs the output tokens a call generated, warning if it was cut off."""
+    output_tokens, max_tokens = record["output_tokens"], record["max_tokens"]
+    if record["truncated"]:
+        logger.warning("%s/%s was cut off at its output budget (%s/%s tokens)",
+                       record["role"], record["task"], output_tokens, max_tokens)
+    elif output_tokens is not None:
+        logger.info("%s/%s generated %d/%s output tokens",
+                    record["role"], record["task"], output_tokens, max_tokens or "uncapped")
+
+
+class ModelRouter:
+    def __init__(self, provider: str, api_key: str, role: str, temperature: float, policy: RoutingPolicy = None):
+        """
+        Routes an agent's calls to a model tier.
+
+        Args:
+            provider: 'groq' or 'gemini'.
+            api_key: API key for the provider.
+            role: Agent role name, used for per-role policy overrides.
+            temperature: Sampling temperature shared by all tiers.
+            policy: Optional routing policy. Defaults to RoutingPolicy.from_env().
+        """
+        if provider not in MODEL_TIERS:
+            raise ValueError(f"Unknown provider: {provider}")
+        self.provider = provider
+        self.api_key = api_key
+        self.role = role
+        self.temperature = temperature
+        self.policy = policy or RoutingPolicy.from_env()
+        self._llms = {}
+
+    def _build_llm(self, model: str, max_tokens: Optional[int]):
+        # GROQ_API_BASE / GEMINI_API_BASE point the clients elsewhere, e.g. at load_test.py's stand-ins
+        if self.provider == "groq":
+            return ChatGroq(model=model, groq_api_key=self.api_key, temperature=self.temperature,
+                            max_tokens=max_tokens, base_url=os.getenv("GROQ_API_BASE"))
+        extra = {}
+        if os.getenv("GEMINI_API_BASE"):
+            extra["base_url"] = os.getenv("GEMINI_API_BASE")
+        if model == MODEL_TIERS["gemini"]["large"]:
+            # gemini-2.5-flash counts thinking against max_output_tokens; keep the whole budget for the reply
+            extra["thinking_budget"] = 0
+        return ChatGoogleGenerativeAI(model=model, google_api_key=self.api_key, temperature=self.temperature,
+                                      max_output_tokens=max_tokens, **extra)
+
+    def invoke(self, prompt, variables: Dict[str, Any], task: str, input_text: str = "",
+               round_num: Optional[int] = None, schema: Type = None, max_tokens: Optional[int] = None):
+        """
+        Runs `prompt` on the model tier chosen for this call, capped at the task's
+        output token budget, and records the tier and generated tokens.
+
+        Args:
+            prompt: The ChatPromptTemplate to run.
+            variables: Values for the prompt's template variables.
+            task: Task type used for routing and budgeting.
+            input_text: Text used to estimate the input size.
+            round_num: Optional debate round, used for early-round routing.
+            schema: Optional pydantic model. When given, the model replies in
+                structured output mode and the parsed object is returned.
+            max_tokens: Optional output cap replacing the task's budget.
+
+        Returns:
+            The model's message, or the parsed `schema` instance.
+        """
+        input_tokens = estimate_tokens(input_text)
+        tier = self.policy.select_tier(self.role, task, input_tokens, round_num)
+        model = MODEL_TIERS[self.provider][tier]
+        max_tokens = max_tokens or self.policy.max_tokens_for(self.role, task)
+        if (model, max_tokens) not in self._llms:
+            self._llms[(model, max_tokens)] = self._build_llm(model, max_tokens)
+        llm = self._llms[(model, max_tokens)]
+
+        record = {"role": self.role, "task": task, "tier": tier, "model": model,
+                  "input_tokens": input_tokens, "max_tokens": max_tokens, "output_tokens": None,
+                  "truncated": False, "error": None}
+        record_call(record)
+        logger.info("Routed %s/%s (~%d input tokens) to %s tier: %s",
+                    self.role, task, input_tokens, tier, model)
+
+        try:
+            if schema is None:
+                message = (prompt | llm).invoke(variables)
+                result = message
+            else:
+                reply = (prompt | llm.with_structured_output(schema, include_raw=True)).invoke(variables)
+                message = reply["raw"]
+                result = reply["parsed"]
+
+            usage = getattr(message, "usage_metadata", None) or {}
+            record["output_tokens"] = usage.get("output_tokens")
+            record["truncated"] = is_truncated(message)
+            report_usage(record)
+
+            if schema is not None and result is None:
+                raise ValueError(f"Structured {task} reply did not match {schema.__name__}")
+        except Exception as e:
+            # The record is already in the session's log; mark it so failed calls don't look pending
+            record["error"] = f"{type(e).__name__}: {e}"
+            raise
+        return result
@@ -1,16 +1,16 @@
 import os
 from typing import List, Dict, Callable
-from langchain_groq import ChatGroq
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from tavily import TavilyClient
+from model_router import ModelRouter
 
 class ProsecutorAgent:
     def __init__(self, gemini_api_key: str, tavily_api_key: str, status_callback: Callable[[str], None] = None):
-        # Using Gemini
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-2.5-flash-lite",
-            google_api_key=gemini_api_key,
+        # Using Gemini, tier picked per call by the router
+        self.router = ModelRouter(
+            provider="gemini",
+            api_key=gemini_api_key,
+            role="prosecutor",
             temperature=0.5 # Higher temperature for creative prosecution
         )
         self.tavily_client = TavilyClient(api_key=tavily_api_key)
@@ -58,8 +58,7 @@ class ProsecutorAgent:
         ])
         
         try:
-            chain = prompt | self.llm
-            response = chain.invoke({})
+            response = self.router.invoke(prompt, {}, "advocacy", f"{damage_context}{model_description}{defense_arguments or ''}")
             return response.content
         except Exception as e:
             return f"❌ Prosecution error: {str(e)}"
@@ -78,9 +77,10 @@ class ProsecutorAgent:
 
 class ProsecutionStrategistAgent:
     def __init__(self, groq_api_key: str, tavily_api_key: str, status_callback: Callable[[str], None] = None):
-        self.llm = ChatGroq(
-            model="llama-3.3-70b-versatile", 
-            groq_api_key=groq_api_key,
+        self.router = ModelRouter(
+            provider="groq",
+            api_key=groq_api_key,
+            role="prosecution_strategist",
             temperature=0.3 # Sharp, factual, and ruthless
         )
         self.tavily_client = TavilyClient(api_key=tavily_api_key)
@@ -92,7 +92,7 @@ class ProsecutionStrategistAgent:
         response = self.tavily_client.search(query=query, search_depth="advanced", max_results=3)
         return response.get('results', [])
 
-    def shred_defense(self, model_description: str, defense_argument: str) -> str:
+    def shred_defense(self, model_description: str, defense_argument: str, round_num: int = None) -> str:
         """The Strategist's core logic: Dismantling the Defense's case."""
         if self.status_callback:
             self.status_callback("🕵️ Prosecution Strategist is reviewing the Defense's lies...")
@@ -114,6 +114,8 @@ class ProsecutionStrategistAgent:
             3. Cost: Is the defense hiding the true intents of the accused?
             4. Attack Plan: Provide 3 lethal questions the Prosecutor should ask on cross-examination.
             
+            LENGTH: Keep your plan under 400 words.
+            
             Be ruthless, precise, and completely intolerant of vague "visionary" talk."""),
             ("user", f"""
             DAMNING EVIDENCE (REBUTTAL):
@@ -129,18 +131,17 @@ class ProsecutionStrategistAgent:
         ])
         
         try:
-            chain = prompt | self.llm
-            response = chain.invoke({})
+            response = self.router.invoke(prompt, {}, "strategy", f"{rebuttal_context}{model_description}{defense_argument}", round_num)
             return response.content
         except Exception as e:
             return f"❌ Strategy error: {str(e)}"
 
-    def strategize(self, model_data: str, defense_arg: str):
+    def strategize(self, model_data: str, defense_arg: str, round_num: int = None):
         """Main entry point for the agent."""
         if self.status_callback:
             self.status_callback("🧠 Formulating prosecution strategy...")
         
-        result = self.shred_defense(model_data, defense_arg)
+        result = self.shred_defense(model_data, defense_arg, round_num)
         
         if self.status_callback:
             self.status_callback("✅ Attack plan ready.")
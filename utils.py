@@ -1,6 +1,7 @@
 import os
 import google.generativeai as genai
 from dotenv import load_dotenv
+from model_router import MODEL_TIERS, estimate_tokens, record_call, report_usage
 
 # Load environment variables
 load_dotenv()
@@ -11,15 +12,22 @@ def configure_genai():
     api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GEMINI_API_KEY1") or os.getenv("GEMINI_API_KEY2")
     if not api_key:
         raise ValueError("No valid GEMINI_API_KEY found in environment variables.")
-    genai.configure(api_key=api_key)
+    if os.getenv("GEMINI_API_BASE"):
+        # Alternate endpoint, e.g. load_test.py's stand-in server
+        genai.configure(api_key=api_key, transport="rest", client_options={"api_endpoint": os.getenv("GEMINI_API_BASE")})
+    else:
+        genai.configure(api_key=api_key)
 
-def generate_content(prompt, model_name=None):
+def generate_content(prompt, model_name=None, max_output_tokens=800, role="clerk", task="summary"):
     """
     Generates content using the specified Gemini model.
     
     Args:
         prompt (str): The input prompt for the model.
-        model_name (str): The name of the model to use. Defaults to "gemini-1.5-flash".
+        model_name (str): The name of the model to use. Defaults to "gemini-2.5-flash-lite".
+        max_output_tokens (int): Cap on generated tokens. Defaults to 800.
+        role (str): Caller name shown in the routing log. Defaults to "clerk".
+        task (str): Task name shown in the routing log. Defaults to "summary".
         
     Returns:
         str: The generated text content.
@@ -27,10 +35,24 @@ def generate_content(prompt, model_name=None):
     if model_name is None:
          model_name = "gemini-2.5-flash-lite"
 
+    # Same record shape as ModelRouter.invoke, so the call shows up in the session's routing log
+    tier = next((t for t, m in MODEL_TIERS["gemini"].items() if m == model_name), "fixed")
+    record = {"role": role, "task": task, "tier": tier, "model": model_name,
+              "input_tokens": estimate_tokens(prompt), "max_tokens": max_output_tokens,
+              "output_tokens": None, "truncated": False, "error": None}
+    record_call(record)
+
     try:
         configure_genai()
         model = genai.GenerativeModel(model_name)
-        response = model.generate_content(prompt)
+        response = model.generate_content(prompt, generation_config={"max_output_tokens": max_output_tokens})
+        usage = getattr(response, "usage_metadata", None)
+        record["output_tokens"] = getattr(usage, "candidates_token_count", None)
+        if response.candidates:
+            reason = response.candidates[0].finish_reason
+            record["truncated"] = getattr(reason, "name", str(reason)).upper() == "MAX_TOKENS"
+        report_usage(record)
         return response.text
     except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
         return f"Error generating content: {e}"